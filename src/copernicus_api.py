@@ -3,14 +3,28 @@ mission data products from Copernicus Data Space Ecosystem (CDSE):
 https://dataspace.copernicus.eu/."""
 
 
-from concurrent.futures import ThreadPoolExecutor
-from multiprocessing import cpu_count
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import nullcontext
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from importlib.util import find_spec
 from pathlib import Path
+from urllib.parse import quote, urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 import logging as log
 import pandas as pd
+import threading
 import requests
+import time
+import sys
+import os
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 from .exceptions import (AttributeNotFoundError,
                          AuthorizationError,
@@ -23,9 +37,26 @@ log.basicConfig(
     format = "%(levelname)s: %(message)s")
 
 
-CATALOG_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products?$filter=Collection"
+CATALOG_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1/Products"
 TOKEN_URL = "https://identity.dataspace.copernicus.eu/auth/realms/CDSE/protocol/openid-connect/token"
 DOWNLOAD_URL = "https://zipper.dataspace.copernicus.eu/odata/v1/Products"
+MAX_CONNECTIONS = 32
+SEGMENTS = 8
+MIN_SEGMENT_SIZE = 16 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+TOKEN_EXPIRY_MARGIN = 30
+PAGE_SIZE = 1000
+MAX_SKIP = 10000
+PART_SUFFIX = ".part"
+TMP_SUFFIX = ".tmp"
+EVICT_SIZE = 64 * 1024 * 1024
+NUMERIC_ATTRS = ('cloudCover', 'orbitNumber', 'relativeOrbitNumber',
+                 'sliceNumber', 'totalSlices')
+CATEGORICAL_ATTRS = ('orbitDirection', 'productType', 'platformShortName',
+                     'platformSerialIdentifier', 'instrumentShortName',
+                     'operationalMode', 'polarisationChannels',
+                     'processingLevel', 'swathIdentifier', 'timeliness')
+DTYPE_BACKENDS = (None, 'numpy_nullable', 'pyarrow')
 
 
 class CopernicusDataspaceAPI(ABC):
@@ -46,6 +77,9 @@ class CopernicusDataspaceAPI(ABC):
         SENTINEL-6
     """
 
+    __slots__ = ('username', 'password', '_token', '_token_exp', '_token_lock',
+                 '_session', '_connections')
+
     def __init__(
             self,
             username: str,
@@ -53,6 +87,29 @@ class CopernicusDataspaceAPI(ABC):
         ) -> None:
         self.username = username
         self.password = password
+        self._token: str | None = None
+        self._token_exp = 0.
+        self._token_lock = threading.Lock()
+        self._session = self._create_session()
+        # Caps simultaneous download streams to the connection pool size
+        self._connections = threading.BoundedSemaphore(MAX_CONNECTIONS)
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Creates HTTP session reusing pooled keep-alive connections for all
+        the requests to the catalogue, identity and download servers."""
+        retries = Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False)
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONNECTIONS,
+            pool_maxsize=MAX_CONNECTIONS,
+            max_retries=retries)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
 
     @property
     @abstractmethod
@@ -67,6 +124,14 @@ class CopernicusDataspaceAPI(ABC):
         raise NotImplementedError
 
     def _get_access_token(self) -> str:
+        """Returns cached access token, requesting a new one shortly before
+        it expires"""
+        with self._token_lock:
+            if self._token and time.monotonic() < self._token_exp:
+                return self._token
+            return self._request_access_token()
+
+    def _request_access_token(self) -> str:
         data = {
             "client_id": "cdse-public",
             "username": self.username,
@@ -74,22 +139,38 @@ class CopernicusDataspaceAPI(ABC):
             "grant_type": "password",
         }
         try:
-            r = requests.post(TOKEN_URL, data=data, timeout=100)
+            r = self._session.post(TOKEN_URL, data=data, timeout=100)
             r.raise_for_status()
         except Exception as e:
             raise AuthorizationError(
                     f"Access token creation failed. Error: {e} \n"
                     f"\tMake sure your login credentials are correct for"
                     " https://dataspace.copernicus.eu/")
-        return r.json()["access_token"]
+        token = r.json()
+        self._token = token["access_token"]
+        self._token_exp = (time.monotonic() + token.get("expires_in", 0)
+                           - TOKEN_EXPIRY_MARGIN)
+        return self._token
 
     @staticmethod
-    def __add_attrs_to_df(product: pd.Series) -> pd.Series:
+    def __add_attrs_to_df(
+            products: pd.DataFrame,
+            records: list[dict]
+        ) -> pd.DataFrame:
         "Extracts Sentinel product attributes and add to the DataFrame"
-        attributes = product.get('Attributes', [])
-        for attr in attributes:
-            product[attr['Name']] = attr['Value']
-        return product
+        attrs = pd.DataFrame(
+            [{sys.intern(attr['Name']): attr['Value']
+              for attr in record.get('Attributes') or []}
+             for record in records],
+            index=products.index)
+        for col in attrs.columns.intersection(NUMERIC_ATTRS):
+            attrs[col] = pd.to_numeric(attrs[col], errors='coerce')
+        # Store repetitive string attributes (e.g. orbitDirection) once
+        for col in attrs.columns.intersection(CATEGORICAL_ATTRS):
+            attrs[col] = attrs[col].astype('category')
+        products = products.drop(
+            columns=attrs.columns.intersection(products.columns))
+        return pd.concat([products, attrs], axis=1)
 
     def query(
             self,
@@ -101,6 +182,7 @@ class CopernicusDataspaceAPI(ABC):
             footprint: str | None = None,
             orderby: str | None = None,
             limit: int | None = None,
+            dtype_backend: str | None = None,
             **kwargs: list[int] | list[float] | list[str]
         ) -> pd.DataFrame:
         """
@@ -125,6 +207,9 @@ class CopernicusDataspaceAPI(ABC):
             Sort order by acquizition time. Can be 'asc' or 'desc'.
         limit : int, optional
             Maximum number of products to return.
+        dtype_backend : str, optional
+            Convert the columns to nullable dtypes, either 'numpy_nullable' or
+            'pyarrow' (requires pyarrow). By default columns are not converted.
         **kwargs : Mapping[str, Union[List[int], List[float], List[str]]]
             Additional filters based on product sepcific attributes.
             Each key should be an attribute name, and the corresponding value
@@ -134,24 +219,30 @@ class CopernicusDataspaceAPI(ABC):
             DataFrame containing the resulting products of the query.
         """
 
-        # Building query string
-        query_str = self._build_query(
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(f"dtype_backend must be one of {DTYPE_BACKENDS}, "
+                             f"'{dtype_backend}' was given")
+        if dtype_backend == 'pyarrow' and find_spec('pyarrow') is None:
+            raise ImportError("dtype_backend='pyarrow' requires pyarrow, "
+                              "install it with `pip install pyarrow`")
+
+        # Building query parameters
+        params = self._build_query(
             start_time=start_time,
             end_time=end_time,
             prod_type=prod_type,
             exclude=exclude,
             footprint=footprint,
-            orderby=orderby,
-            limit=limit)
+            orderby=orderby)
 
         # Send query
         try:
-            json = requests.get(query_str, timeout=100).json()
+            records = self._fetch_products(params, limit)
         except Exception as e:
-            raise QueryError(f"{e.__class__.__name__}: Query failed: {e.args[0]}")
+            raise QueryError(f"{e.__class__.__name__}: Query failed: {e}")
 
         # convert dict into pd.Dataframe
-        products = pd.DataFrame.from_dict(json['value'])
+        products = pd.DataFrame.from_dict(records)
 
         # Suggest product types if the query result is empty
         if products.empty and prod_type:
@@ -160,11 +251,13 @@ class CopernicusDataspaceAPI(ABC):
                          f"for {self.mission} mission: {self.prod_types}")
                 return products
         # Extract more Attributes and add as new fields in DataFram
-        products = products.apply(self.__add_attrs_to_df, axis=1)
+        products = self.__add_attrs_to_df(products, records)
         # Apply product specific attribute filter
         if kwargs:
             products = filter_by_attributes(products, **kwargs
                                             ).reset_index(drop=True)
+        if dtype_backend:
+            products = products.convert_dtypes(dtype_backend=dtype_backend)
         return products
 
     def _build_query(
@@ -174,56 +267,325 @@ class CopernicusDataspaceAPI(ABC):
             prod_type: str | None = None,
             exclude: str | None = None,
             footprint: str | None = None,
-            orderby: str | None = None,
-            limit: int | None = None
-        ) -> str:
-        """Builds the API product request string based on given properties and
-        constraints.
+            orderby: str | None = None
+        ) -> dict[str, str]:
+        """Builds the API product request parameters based on given properties
+        and constraints.
 
-        Returns: str
-            API product request string
+        Returns: dict
+            API product request parameters
         """
 
-        query_str = f"{CATALOG_URL}/Name eq '{self.mission}'" + \
+        filter_str = f"Collection/Name eq {_literal(self.mission)}" + \
             f" and ContentDate/Start gt {start_time}T00:00:00.000Z" + \
             f" and ContentDate/Start lt {end_time}T00:00:00.000Z"
         if prod_type:
-            query_str += f" and contains(Name, '{prod_type}')"
+            filter_str += f" and contains(Name,{_literal(prod_type)})"
         if exclude:
-            query_str += f" and not contains(Name,'{exclude}')"
+            filter_str += f" and not contains(Name,{_literal(exclude)})"
         if footprint:
-            query_str += f" and OData.CSC.Intersects(area=geography'SRID=4326;{footprint}')"
+            filter_str += " and OData.CSC.Intersects(area=geography" + \
+                _literal(f"SRID=4326;{footprint}") + ")"
+        params = {"$filter": filter_str}
         if orderby:
-            query_str += f"&$orderby=ContentDate/Start {orderby}"
+            params["$orderby"] = f"ContentDate/Start {orderby}"
+        params["$expand"] = "Attributes"
+        return params
+
+    def _fetch_page(self, url: str, params: dict | None = None) -> dict:
+        """Sends a single catalogue request and returns the parsed response"""
+        if params:
+            # Encode once, with spaces as %20 rather than '+'
+            params = urlencode(params, quote_via=quote, safe="$/'(),:")
+        r = self._session.get(url, params=params, timeout=100)
+        r.raise_for_status()
+        return loads(r.content)
+
+    def _fetch_products(
+            self,
+            params: dict[str, str],
+            limit: int | None = None
+        ) -> list[dict]:
+        """Collects the products of the query page by page, as the catalogue
+        returns at most `PAGE_SIZE` products per response.
+
+        Returns: list
+            Product records of all the pages
+        """
+        # Offset paging needs a stable order, the catalogue breaks ties by Id
+        # itself whenever $orderby is given
+        params = {"$orderby": "ContentDate/Start asc", **params}
+
         if limit:
-            query_str += f"&$top={limit}"
-        query_str += "&$expand=Attributes"
-        return query_str
+            top = min(PAGE_SIZE, limit)
+            page = self._fetch_page(CATALOG_URL,
+                                    {**params, "$top": top, "$count": "true"})
+            records = page['value']
+            total = min(limit, page.get('@odata.count', limit))
+            if total > MAX_SKIP + PAGE_SIZE:
+                _warn_truncated(MAX_SKIP + PAGE_SIZE)
+                total = MAX_SKIP + PAGE_SIZE
+            if len(records) < top or total <= top:
+                return records[:total]
+            # Remaining page offsets are known, fetch the pages concurrently
+            pages = [{**params, "$top": min(PAGE_SIZE, total - skip),
+                      "$skip": skip}
+                     for skip in range(top, total, PAGE_SIZE)]
+            with ThreadPoolExecutor(min(len(pages), MAX_CONNECTIONS)) as executor:
+                for page in executor.map(self._fetch_page,
+                                         [CATALOG_URL] * len(pages), pages):
+                    records.extend(page['value'])
+            return records
+
+        records = []
+        page = self._fetch_page(CATALOG_URL, {**params, "$top": PAGE_SIZE})
+        while True:
+            records.extend(page['value'])
+            next_link = page.get('@odata.nextLink')
+            if not next_link:
+                return records
+            if len(records) > MAX_SKIP:
+                _warn_truncated(len(records))
+                return records
+            page = self._fetch_page(next_link)
+
+    def _auth_headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self._get_access_token()}"}
+
+    def _head(
+            self,
+            url: str,
+            headers: dict[str, str]
+        ) -> tuple[int | None, bool]:
+        """Returns product size in bytes (if known) and whether the server
+        accepts byte ranges"""
+        r = self._session.head(url, headers=headers, allow_redirects=True,
+                               timeout=100)
+        if not r.ok:
+            return None, False
+        size = r.headers.get("Content-Length")
+        return (int(size) if size else None,
+                r.headers.get("Accept-Ranges") == "bytes")
+
+    def _product_info(self, uid: str) -> tuple[int | None, bool]:
+        """Returns product size in bytes and whether the server accepts byte
+        ranges, (None, False) if they could not be retrieved"""
+        try:
+            return self._head(f"{DOWNLOAD_URL}({uid})/$value",
+                              self._auth_headers())
+        except (requests.RequestException, AuthorizationError):
+            return None, False
 
-    def download_by_id(self, uid: str, out_path: Path) -> None:
-        """Download single products by UIDs.
+    def _download_segment(
+            self,
+            url: str,
+            headers: dict[str, str],
+            fd: int,
+            start: int,
+            end: int,
+            progress: Callable[[int], None] | None = None
+        ) -> bool:
+        """Writes the byte range [start, end] of the product at its offset.
+        Returns False if the server ignored the range request."""
+        range_headers = {**headers, "Range": f"bytes={start}-{end}"}
+        with self._connections, \
+                self._session.get(url, headers=range_headers, stream=True,
+                                  timeout=100) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return False
+            offset = evicted = start
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                if progress:
+                    progress(len(chunk))
+                if offset - evicted >= EVICT_SIZE:
+                    _drop_page_cache(fd, start, offset - start)
+                    evicted = offset
+        if offset != end + 1:
+            raise DownloadError(f"Incomplete byte range {start}-{end}")
+        return True
+
+    def _download_segments(
+            self,
+            url: str,
+            headers: dict[str, str],
+            out_file: str,
+            size: int,
+            segments: int,
+            progress: Callable[[int], None] | None = None,
+            executor: ThreadPoolExecutor | None = None
+        ) -> bool:
+        """Downloads the product with parallel range requests into the
+        pre-allocated file. Returns False if byte ranges are not supported."""
+        step = -(-size // segments)
+        ranges = [(start, min(start + step, size) - 1)
+                  for start in range(0, size, step)]
+        # Segments leave holes until all of them finish, so this file is
+        # never resumed, unlike the `PART_SUFFIX` one of the single stream
+        tmp_file = out_file + TMP_SUFFIX
+        fd = os.open(tmp_file, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+        try:
+            try:
+                _preallocate(fd, size)
+                with (nullcontext(executor) if executor
+                      else ThreadPoolExecutor(len(ranges))) as pool:
+                    futures = [pool.submit(self._download_segment, url,
+                                           headers, fd, start, end, progress)
+                               for start, end in ranges]
+                    try:
+                        done = all(future.result() for future in futures)
+                    finally:
+                        # Segments write to fd, let them finish before closing
+                        for future in futures:
+                            future.cancel()
+                        wait(futures)
+            finally:
+                _drop_page_cache(fd)
+                os.close(fd)
+        except BaseException:
+            # Do not leave the pre-allocated file behind
+            os.remove(tmp_file)
+            raise
+        if done:
+            os.replace(tmp_file, out_file)
+        else:
+            os.remove(tmp_file)
+        return done
+
+    def _download_stream(
+            self,
+            url: str,
+            headers: dict[str, str],
+            out_file: str,
+            size: int | None = None,
+            resume: bool = False,
+            progress: Callable[[int], None] | None = None
+        ) -> None:
+        """Downloads the product over a single connection, resuming the
+        partial file of a previous run if the server accepts byte ranges"""
+        part_file = out_file + PART_SUFFIX
+        offset = 0
+        if resume and os.path.isfile(part_file):
+            offset = os.path.getsize(part_file)
+            if size is not None and offset > size:
+                offset = 0
+        if offset and offset == size:
+            if progress:
+                progress(offset)
+            os.replace(part_file, out_file)
+            return
+        if offset:
+            headers = {**headers, "Range": f"bytes={offset}-"}
+
+        with self._connections, \
+                self._session.get(url, headers=headers, stream=True,
+                                  timeout=100) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                # Server sent the whole product
+                offset = 0
+            with open(part_file, "ab" if offset else "wb") as file:
+                if progress and offset:
+                    progress(offset)
+                response.raw.decode_content = True
+                written = 0
+                while chunk := response.raw.read(CHUNK_SIZE):
+                    file.write(chunk)
+                    if progress:
+                        progress(len(chunk))
+                    written += len(chunk)
+                    if written >= EVICT_SIZE:
+                        file.flush()
+                        _drop_page_cache(file.fileno())
+                        written = 0
+                file.flush()
+                _drop_page_cache(file.fileno())
+        if size is not None and os.path.getsize(part_file) != size:
+            # Keep the partial file, the next run resumes it
+            raise DownloadError(f"Incomplete download, {size} bytes expected "
+                                f"but {os.path.getsize(part_file)} received")
+        os.replace(part_file, out_file)
+
+    def _download(
+            self,
+            url: str,
+            out_file: str,
+            segments: int,
+            progress: Callable[[int], None] | None = None,
+            size: int | None = None,
+            ranges: bool = False,
+            executor: ThreadPoolExecutor | None = None
+        ) -> None:
+        """Downloads the product, in parallel byte ranges when possible.
+        Products already downloaded in full are skipped."""
+        headers = self._auth_headers()
+
+        if size is None:
+            size, ranges = self._head(url, headers)
+        if size is not None and os.path.isfile(out_file) \
+                and os.path.getsize(out_file) == size:
+            if progress:
+                progress(size)
+            return
+        if segments > 1 and ranges and size and size >= 2 * MIN_SEGMENT_SIZE:
+            segments = min(segments, size // MIN_SEGMENT_SIZE)
+            if self._download_segments(url, headers, out_file, size, segments,
+                                       progress, executor):
+                return
+        # Server does not support byte ranges (or product is small)
+        self._download_stream(url, headers, out_file, size, ranges, progress)
+
+    def download_by_id(
+            self,
+            uid: str,
+            out_path: Path,
+            segments: int=SEGMENTS,
+            progress: Callable[[int], None] | None = None,
+            size: int | None = None,
+            ranges: bool = False,
+            executor: ThreadPoolExecutor | None = None
+        ) -> None:
+        """Download single products by UIDs. Products already downloaded to
+        `out_path` are skipped, interrupted single stream downloads are resumed.
 
         Parameters:
         uid : str
             UID of the product to be downloaded
         out_path : Path
             Output file path for downloaded product
+        segments : int
+            Number of parallel byte range requests per product. Each range is
+            at least `MIN_SEGMENT_SIZE` bytes, smaller products are downloaded
+            over one connection.
+        progress : callable, optional
+            Called with the number of bytes written after each chunk. Must be
+            thread-safe, as segments report from their own threads.
+        size : int, optional
+            Product size in bytes, if already known. Skips the HEAD request
+            for the product size.
+        ranges : bool
+            Whether the server accepts byte ranges, used along with `size`.
+        executor : ThreadPoolExecutor, optional
+            Thread pool for the byte range requests, shared between downloads.
+            By default a pool is created per product.
         """
 
-        access_token = self._get_access_token()
-        headers = {"Authorization": f"Bearer {access_token}"}
-
         url = f"{DOWNLOAD_URL}({uid})/$value"
-
-        session = requests.Session()
-        session.headers.update(headers)
-        response = session.get(url, headers=headers, stream=True)
+        out_file = str(out_path) + ".zip"
 
         try:
-            with open(str(out_path) + ".zip", "wb") as file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        file.write(chunk)
+            try:
+                self._download(url, out_file, segments, progress, size,
+                               ranges, executor)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code != 401:
+                    raise
+                # Token was revoked before its expiry, retry once with new one
+                self._token = None
+                self._download(url, out_file, segments, progress, size,
+                               ranges, executor)
         except Exception as e:
             raise DownloadError(f"Failed to download {out_path.name}\n{e}")
 
@@ -231,7 +593,7 @@ class CopernicusDataspaceAPI(ABC):
             self,
             products: pd.DataFrame,
             out_dir: Path,
-            threads: int=4,
+            threads: int | None = None,
             show_progress: bool=True
         ) -> None:
         """Download all products in parallel using multithreading.
@@ -241,100 +603,196 @@ class CopernicusDataspaceAPI(ABC):
             Pandas Dataframe containing UIDs of the products to be downloaded
         out_dir : Path
             Output directory path for downloaded products
-        threads : int
-            Number of simultaneous downloads
+        threads : int, optional
+            Number of simultaneous downloads. Defaults to one per product, up
+            to `MAX_CONNECTIONS`.
         show_progress : bool
             Show download progress bar
         """
 
-        if show_progress:
-            pbar = tqdm(total=len(products), unit="files")
+        if products.empty:
+            return
 
         # Generate tupe of UIds and Names for each product
-        prod_ids = [(prod.Id, prod.Name) for _, prod in products.iterrows()]
+        prod_ids = list(zip(products['Id'].to_numpy(),
+                            products['Name'].to_numpy()))
 
-        def download_worker(prod_id: str, prod_name: str) -> None:
+        threads_ = threads if threads else min(MAX_CONNECTIONS, len(products))
+        infos = [(None, False)] * len(prod_ids)
+        if show_progress:
+            # Prefetch product sizes to track the progress in bytes
+            with ThreadPoolExecutor(max(threads_, 1)) as executor:
+                infos = list(executor.map(self._product_info,
+                                          [prod_id for prod_id, _ in prod_ids]))
+            sizes = [size for size, _ in infos]
+            total = None if None in sizes else sum(sizes)
+            pbar = tqdm(total=total, unit="B", unit_scale=True,
+                        unit_divisor=1024)
+        pbar_lock = threading.Lock()
+
+        def update_pbar(n: int) -> None:
+            with pbar_lock:
+                pbar.update(n)
+
+        def download_worker(
+                prod_id: str,
+                prod_name: str,
+                size: int | None,
+                ranges: bool
+            ) -> None:
             out_file = out_dir / f"{prod_name}"
             try:
-                self.download_by_id(prod_id, out_path=out_file)
+                self.download_by_id(
+                    prod_id,
+                    out_path=out_file,
+                    progress=update_pbar if show_progress else None,
+                    size=size,
+                    ranges=ranges,
+                    executor=segment_executor)
             except Exception as e:
                 raise DownloadError(f"'{e.__class__.__name__}': "
                         f"Failed to download {prod_name}: {e.args[0]}")
+
+        # Byte range requests of all the products share one pool, as at most
+        # MAX_CONNECTIONS of them can hold a connection at a time
+        with ThreadPoolExecutor(MAX_CONNECTIONS) as segment_executor, \
+                ThreadPoolExecutor(max(threads_, 1)) as executor:
+            futures = [executor.submit(download_worker, prod_id, prod_name,
+                                       size, ranges)
+                       for (prod_id, prod_name), (size, ranges)
+                       in zip(prod_ids, infos)]
+            try:
+                # Surface worker errors as soon as they occur
+                for future in as_completed(futures):
+                    future.result()
             finally:
+                for future in futures:
+                    future.cancel()
                 if show_progress:
-                    pbar.update(1)
-
-        threads_ = threads if threads else min(cpu_count() - 2, len(products))
-        with ThreadPoolExecutor(threads_) as executor:
-            for prod_id, prod_name in prod_ids:
-                executor.submit(download_worker, prod_id, prod_name)
-
-        if show_progress:
-            pbar.close()
+                    pbar.close()
 
 
 class Sentinel1API(CopernicusDataspaceAPI):
     """Class to download Sentinel-1 products"""
 
+    __slots__ = ()
+
+    _PROD_TYPES = ('RAW', 'SLC', 'GRD', 'GRDH', 'GRDM', 'OCN', 'IW',
+                   'EW', 'WV')
+
     @property
     def mission(self):
         return "SENTINEL-1"
 
     @property
     def prod_types(self) -> list[str]:
-        return ['RAW', 'SLC', 'GRD', 'GRDH', 'GRDM', 'OCN', 'IW', 'EW', 'WV']
+        return list(self._PROD_TYPES)
 
 
 class Sentinel2API(CopernicusDataspaceAPI):
     """Class to download Sentinel-2 products"""
 
+    __slots__ = ()
+
+    _PROD_TYPES = ('L1C', 'L2A')
+
     @property
     def mission(self):
         return "SENTINEL-2"
 
     @property
     def prod_types(self) -> list[str]:
-        return ['L1C', 'L2A']
+        return list(self._PROD_TYPES)
 
 
 class Sentinel3API(CopernicusDataspaceAPI):
     """Class to download Sentinel-3 products"""
 
+    __slots__ = ()
+
+    _PROD_TYPES = ('OL_1', 'OL_2', 'SL_1', 'SL_2', 'SR_1', 'SR_2',
+                   'SR', 'SY_2')
+
     @property
     def mission(self):
         return "SENTINEL-3"
 
     @property
     def prod_types(self) -> list[str]:
-        return ['OL_1', 'OL_2', 'SL_1', 'SL_2', 'SR_1', 'SR_2', 'SR', 'SY_2']
+        return list(self._PROD_TYPES)
 
 
 class Sentinel5API(CopernicusDataspaceAPI):
     """Class to download Sentinel-5P products"""
 
+    __slots__ = ()
+
+    _PROD_TYPES = (
+        'L1B_RA_BD1', 'L1B_RA_BD2', 'L1B_RA_BD3', 'L1B_RA_BD4',
+        'L1B_RA_BD5', 'L1B_RA_BD6', 'L1B_RA_BD7', 'L1B_RA_BD8',
+        'L2__AER_AI', 'L2__AER_LH', 'L2__CH4', 'L2__CLOUD', 'L2__CO',
+        'L2__HCHO', 'L2__NO2', 'L2__NP_BD3', 'L2__NP_BD6', 'L2__NP_BD7',
+        'L2__O3_TCL', 'L2__O3__PR', 'L2__O3', 'L2__SO2')
+
     @property
     def mission(self):
         return "SENTINEL-5P"
 
     @property
     def prod_types(self) -> list[str]:
-        return ['L1B_RA_BD1', 'L1B_RA_BD2', 'L1B_RA_BD3', 'L1B_RA_BD4',
-                'L1B_RA_BD5', 'L1B_RA_BD6', 'L1B_RA_BD7', 'L1B_RA_BD8',
-                'L2__AER_AI', 'L2__AER_LH', 'L2__CH4', 'L2__CLOUD', 'L2__CO',
-                'L2__HCHO', 'L2__NO2', 'L2__NP_BD3', 'L2__NP_BD6', 'L2__NP_BD7',
-                'L2__O3_TCL', 'L2__O3__PR', 'L2__O3', 'L2__SO2']
+        return list(self._PROD_TYPES)
 
 
 class Sentinel6API(CopernicusDataspaceAPI):
     """Class to download Sentinel-6 products"""
 
+    __slots__ = ()
+
+    _PROD_TYPES = ('MW_2__AMR', 'P4_1B_LR', 'P4_2__LR')
+
     @property
     def mission(self):
         return "SENTINEL-3"
 
     @property
     def prod_types(self) -> list[str]:
-        return ['MW_2__AMR', 'P4_1B_LR', 'P4_2__LR']
+        return list(self._PROD_TYPES)
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserves the disk space for the file, falling back to a sparse file
+    where fallocate is not supported"""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+
+def _drop_page_cache(fd: int, offset: int=0, length: int=0) -> None:
+    """Evicts the written range of the file from the page cache, so large
+    downloads do not build up cached pages. Dirty pages are only queued for
+    write-back and get evicted by the next call. Advisory, errors are ignored.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _warn_truncated(count: int) -> None:
+    log.warning(f"Query matches more products than the catalogue can page "
+                f"through, only the first {count} are returned. Narrow the "
+                "query (e.g. time range or footprint) to get the rest.")
+
+
+def _literal(value: str) -> str:
+    """Returns OData string literal with the single quotes escaped"""
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
 
 
 def filter_by_cloud_cover(
@@ -357,10 +815,7 @@ def filter_by_cloud_cover(
         Filtered DataFrame containing the resulting products.
     """
     try:
-        return prod_df[
-                (prod_df['cloudCover'] >= min_cover) &
-                (prod_df['cloudCover'] <= max_cover)
-            ]
+        return prod_df[prod_df['cloudCover'].between(min_cover, max_cover)]
     except KeyError as e:
         raise AttributeNotFoundError(e)
 
@@ -1,12 +1,20 @@
-import geopandas as gpd
 from pathlib import Path
+from pyogrio.raw import read
+from shapely import from_wkb, to_wkt, union_all
 from shapely.wkt import loads
 
 from .exceptions import WKTError
 
 
+WKT_TYPES = ('POINT', 'LINESTRING', 'LINEARRING', 'POLYGON', 'MULTIPOINT',
+             'MULTILINESTRING', 'MULTIPOLYGON', 'GEOMETRYCOLLECTION')
+
+
 def is_wkt(text: str) -> bool:
     """Check if the input string is in WKT format."""
+    # Cheap check to skip parsing file paths
+    if not text.lstrip()[:18].upper().startswith(WKT_TYPES):
+        return False
     try:
         loads(text)
         return True
@@ -14,6 +22,13 @@ def is_wkt(text: str) -> bool:
         return False
 
 
+def _file_to_wkt(aoi: Path | str) -> str:
+    """Returns WKT of the union of all the geometries in the vector file"""
+    # Read only the WKB geometries, without attribute columns or GeoDataFrame
+    _, _, geometry, _ = read(aoi, columns=[])
+    return to_wkt(union_all(from_wkb(geometry)), rounding_precision=-1)
+
+
 def to_openeo_wkt(aoi: Path | str | None) -> str | None:
     """Returns WKT coordinates of area extent"""
     if aoi is None:
@@ -24,13 +39,11 @@ def to_openeo_wkt(aoi: Path | str | None) -> str | None:
             return aoi
         else:
             try:
-                gdf = gpd.read_file(aoi)
-                return gdf.unary_union.wkt
+                return _file_to_wkt(aoi)
             except Exception as e:
                 raise WKTError(e)
 
     try:
-        gdf = gpd.read_file(aoi)
-        return gdf.unary_union.wkt
+        return _file_to_wkt(aoi)
     except Exception as e:
         raise WKTError(e)
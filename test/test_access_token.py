@@ -0,0 +1,67 @@
+import pytest
+
+from src import copernicus_api
+from src.copernicus_api import Sentinel1API, TOKEN_EXPIRY_MARGIN
+from src.exceptions import AuthorizationError
+
+
+class TokenResponse:
+
+    def __init__(self, token: str, expires_in: int) -> None:
+        self.token = token
+        self.expires_in = expires_in
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> dict:
+        return {'access_token': self.token, 'expires_in': self.expires_in}
+
+
+class TokenSession:
+    """Mints a new token with a 600 seconds lifetime on every request"""
+
+    def __init__(self) -> None:
+        self.posts = 0
+
+    def post(self, url: str, data: dict, timeout: int) -> TokenResponse:
+        self.posts += 1
+        return TokenResponse(f"token{self.posts}", 600)
+
+
+class TestAccessToken:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        self.now = 1000.
+        monkeypatch.setattr(copernicus_api.time, "monotonic",
+                            lambda: self.now)
+        self.session = TokenSession()
+        self.api = Sentinel1API(username="user", password="pass")
+        self.api._session = self.session
+
+    def test_token_is_cached(self):
+        assert self.api._get_access_token() == "token1"
+        assert self.api._get_access_token() == "token1"
+        assert self.session.posts == 1
+        assert self.api._token_exp == 1000. + 600 - TOKEN_EXPIRY_MARGIN
+
+    def test_token_refresh_before_expiry(self):
+        self.api._get_access_token()
+
+        # Still valid until the safety margin before its expiry
+        self.now += 600 - TOKEN_EXPIRY_MARGIN - 1
+        assert self.api._get_access_token() == "token1"
+
+        self.now += 1
+        assert self.api._get_access_token() == "token2"
+        assert self.session.posts == 2
+
+    def test_token_request_failure(self):
+        def post(url, data, timeout):
+            raise ConnectionError("unreachable")
+
+        self.session.post = post
+        with pytest.raises(AuthorizationError):
+            self.api._get_access_token()
+        assert self.api._token is None
@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+
+from src.copernicus_api import (Sentinel2API,
+                                filter_by_attributes,
+                                filter_by_cloud_cover)
+from src.exceptions import AttributeNotFoundError
+
+
+def product(i: int, cloud_cover, direction: str) -> dict:
+    return {'Id': str(i), 'Name': f'S2A_MSIL1C_{i}', 'Attributes': [
+        {'Name': 'cloudCover', 'Value': cloud_cover},
+        {'Name': 'orbitDirection', 'Value': direction},
+        {'Name': 'tileId', 'Value': f'29SN{i}'}]}
+
+
+class TestAttributes:
+
+    def query(self, monkeypatch, records: list[dict], **kwargs) -> pd.DataFrame:
+        monkeypatch.setattr(Sentinel2API, "_fetch_page",
+                            lambda api, url, params=None: {'value': records})
+        api = Sentinel2API(username="user", password="pass")
+        return api.query(start_time="2024-01-01", end_time="2024-01-15",
+                         **kwargs)
+
+    @pytest.mark.parametrize("rows", [1, 4])
+    def test_attribute_columns(self, monkeypatch, rows):
+        records = [product(i, str(i * 10), 'ASCENDING') for i in range(rows)]
+        products = self.query(monkeypatch, records)
+
+        assert list(products.columns) == ['Id', 'Name', 'Attributes',
+                                          'cloudCover', 'orbitDirection',
+                                          'tileId']
+        assert products['tileId'].tolist() == [f'29SN{i}' for i in range(rows)]
+
+    def test_missing_attributes(self, monkeypatch):
+        records = [product(0, 5, 'ASCENDING'), {'Id': '1', 'Name': 'S2B'}]
+        products = self.query(monkeypatch, records)
+
+        assert products['cloudCover'].isna().tolist() == [False, True]
+
+    @pytest.mark.parametrize("rows", [1, 4])
+    def test_attribute_dtypes(self, monkeypatch, rows):
+        records = [product(i, i * 10, 'ASCENDING') for i in range(rows)]
+        products = self.query(monkeypatch, records)
+
+        # Dtypes do not depend on the number of products
+        assert pd.api.types.is_numeric_dtype(products['cloudCover'])
+        assert isinstance(products['orbitDirection'].dtype, pd.CategoricalDtype)
+        assert not isinstance(products['tileId'].dtype, pd.CategoricalDtype)
+
+    def test_numeric_string_attributes(self, monkeypatch):
+        records = [product(i, str(i * 10.5), 'ASCENDING') for i in range(3)]
+        products = self.query(monkeypatch, records)
+
+        assert products['cloudCover'].tolist() == [0., 10.5, 21.]
+
+    def test_query_filters(self, monkeypatch):
+        records = [product(i, i * 10, 'ASCENDING' if i % 2 else 'DESCENDING')
+                   for i in range(6)]
+        products = self.query(monkeypatch, records, cloudCover=[10, 40],
+                              orbitDirection=['ASCENDING'])
+
+        assert products['Id'].tolist() == ['1', '3']
+
+    def test_filter_by_cloud_cover(self):
+        products = pd.DataFrame({'cloudCover': [0., 10., 30., 30.5, None]})
+
+        filtered = filter_by_cloud_cover(products, 10, 30)
+        assert filtered['cloudCover'].tolist() == [10., 30.]
+
+    def test_unknown_attribute(self):
+        products = pd.DataFrame({'Id': ['0']})
+
+        with pytest.raises(AttributeNotFoundError):
+            filter_by_cloud_cover(products)
+        with pytest.raises(AttributeNotFoundError):
+            filter_by_attributes(products, orbitDirection=['ASCENDING'])
+
+    def test_numpy_nullable_backend(self, monkeypatch):
+        records = [product(0, 5.5, 'ASCENDING'), {'Id': '1', 'Name': 'S2B'}]
+        products = self.query(monkeypatch, records,
+                              dtype_backend='numpy_nullable')
+
+        assert products['cloudCover'].dtype == pd.Float64Dtype()
+        assert products['cloudCover'][1] is pd.NA
+        assert products['Id'].dtype == pd.StringDtype()
+        assert isinstance(products['orbitDirection'].dtype, pd.CategoricalDtype)
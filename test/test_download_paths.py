@@ -0,0 +1,244 @@
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from src import copernicus_api
+from src.copernicus_api import Sentinel1API
+from src.exceptions import DownloadError
+
+
+class ProductHandler(BaseHTTPRequestHandler):
+    """Serves `data` for every product, honouring byte ranges if enabled"""
+
+    data = b""
+    ranges = True
+    token = "token"
+    fail_ranges = False
+    truncate = False
+    requests: list[tuple[str, str | None]] = []
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization") != f"Bearer {self.token}":
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        return True
+
+    def do_HEAD(self) -> None:
+        self.requests.append(("HEAD", None))
+        if not self._authorized():
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.data)))
+        if self.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        range_header = self.headers.get("Range")
+        self.requests.append(("GET", range_header))
+        if not self._authorized():
+            return
+        if range_header and self.fail_ranges:
+            self.send_response(403)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.truncate:
+            # Connection drops halfway, the length is unknown to the client
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(self.data[:len(self.data) // 2])
+            return
+        if range_header and self.ranges:
+            start, end = range_header.split("=")[1].split("-")
+            end = int(end) if end else len(self.data) - 1
+            body = self.data[int(start):end + 1]
+            self.send_response(206)
+        else:
+            body = self.data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestDownloadPaths:
+
+    data = os.urandom(1024 * 1024 + 123)
+
+    @classmethod
+    def setup_class(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ProductHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/Products"
+
+    @classmethod
+    def teardown_class(cls):
+        cls.server.shutdown()
+
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        ProductHandler.data = self.data
+        ProductHandler.ranges = True
+        ProductHandler.token = "token"
+        ProductHandler.fail_ranges = False
+        ProductHandler.truncate = False
+        ProductHandler.requests = []
+        monkeypatch.setattr(copernicus_api, "DOWNLOAD_URL", self.url)
+        # Split the test product into several segments
+        monkeypatch.setattr(copernicus_api, "MIN_SEGMENT_SIZE", 64 * 1024)
+
+    def api_instance(self, token: str="token") -> Sentinel1API:
+        api = Sentinel1API(username="user", password="pass")
+        api._token = token
+        api._token_exp = time.monotonic() + 3600
+        return api
+
+    def range_requests(self) -> list[str]:
+        return [r for method, r in ProductHandler.requests
+                if method == "GET" and r]
+
+    def test_segmented_download(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            self.api_instance().download_by_id("uid", out_path)
+
+            assert Path(f"{out_path}.zip").read_bytes() == self.data
+            assert len(self.range_requests()) == copernicus_api.SEGMENTS
+            assert os.listdir(tmp_dir) == ["product.zip"]
+
+    def test_fallback_without_ranges(self):
+        ProductHandler.ranges = False
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            self.api_instance().download_by_id("uid", out_path)
+
+            assert Path(f"{out_path}.zip").read_bytes() == self.data
+            assert os.listdir(tmp_dir) == ["product.zip"]
+            assert self.range_requests() == []
+
+    def test_shared_segment_executor(self, monkeypatch):
+        threads = []
+        download_segment = Sentinel1API._download_segment
+
+        def record_thread(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return download_segment(*args, **kwargs)
+
+        monkeypatch.setattr(Sentinel1API, "_download_segment", record_thread)
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                ThreadPoolExecutor(2, thread_name_prefix="shared") as pool:
+            out_path = Path(tmp_dir) / "product"
+            self.api_instance().download_by_id("uid", out_path, executor=pool)
+
+            assert Path(f"{out_path}.zip").read_bytes() == self.data
+            assert len(threads) == copernicus_api.SEGMENTS
+            assert all(name.startswith("shared") for name in threads)
+
+    def test_retry_on_unauthorized(self, monkeypatch):
+        def request_access_token(api):
+            api._token = "token"
+            return api._token
+
+        monkeypatch.setattr(Sentinel1API, "_request_access_token",
+                            request_access_token)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            self.api_instance(token="revoked").download_by_id("uid", out_path)
+
+            assert Path(f"{out_path}.zip").read_bytes() == self.data
+
+    def test_download_all_progress(self, monkeypatch):
+        updates = []
+        monkeypatch.setattr(copernicus_api.tqdm, "update",
+                            lambda pbar, n: updates.append(n))
+        products = pd.DataFrame([{'Id': 'a', 'Name': 'A'},
+                                 {'Id': 'b', 'Name': 'B'}])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api_instance().download_all(products, Path(tmp_dir))
+
+            assert sorted(os.listdir(tmp_dir)) == ["A.zip", "B.zip"]
+            assert sum(updates) == 2 * len(self.data)
+            # Prefetched sizes are reused, one HEAD per product
+            heads = [r for r in ProductHandler.requests if r[0] == "HEAD"]
+            assert len(heads) == 2
+
+    def test_download_all_without_ranges(self):
+        ProductHandler.ranges = False
+        products = pd.DataFrame([{'Id': 'a', 'Name': 'A'}])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api_instance().download_all(products, Path(tmp_dir))
+
+            assert Path(tmp_dir, "A.zip").read_bytes() == self.data
+            # No range requests are wasted once the HEAD showed no support
+            assert ProductHandler.requests == [("HEAD", None), ("GET", None)]
+
+    def test_download_all_tolerates_failed_prefetch(self, monkeypatch):
+        head = Sentinel1API._head
+        calls = []
+
+        def fail_first_head(api, *args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise copernicus_api.requests.ConnectionError("unreachable")
+            return head(api, *args, **kwargs)
+
+        monkeypatch.setattr(Sentinel1API, "_head", fail_first_head)
+        products = pd.DataFrame([{'Id': 'a', 'Name': 'A'}])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.api_instance().download_all(products, Path(tmp_dir))
+
+            # Download itself looks up the size again
+            assert Path(tmp_dir, "A.zip").read_bytes() == self.data
+            assert len(calls) == 2
+
+    def test_skip_complete_download(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            Path(f"{out_path}.zip").write_bytes(self.data)
+            self.api_instance().download_by_id("uid", out_path)
+
+            assert ProductHandler.requests == [("HEAD", None)]
+
+    def test_resume_partial_download(self):
+        ProductHandler.data = self.data[:100_000]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            Path(f"{out_path}.zip.part").write_bytes(self.data[:30_000])
+            self.api_instance().download_by_id("uid", out_path)
+
+            assert Path(f"{out_path}.zip").read_bytes() == self.data[:100_000]
+            assert self.range_requests() == ["bytes=30000-"]
+
+    def test_truncated_stream_keeps_part_file(self):
+        ProductHandler.data = self.data[:100_000]
+        ProductHandler.truncate = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            with pytest.raises(DownloadError):
+                self.api_instance().download_by_id("uid", out_path)
+
+            assert os.listdir(tmp_dir) == ["product.zip.part"]
+            assert Path(f"{out_path}.zip.part").read_bytes() == \
+                self.data[:50_000]
+
+    def test_failed_segment_removes_tmp_file(self):
+        ProductHandler.fail_ranges = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out_path = Path(tmp_dir) / "product"
+            with pytest.raises(DownloadError):
+                self.api_instance().download_by_id("uid", out_path)
+
+            assert os.listdir(tmp_dir) == []
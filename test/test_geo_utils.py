@@ -0,0 +1,55 @@
+import json
+import tempfile
+from pathlib import Path
+
+import pytest
+from shapely.wkt import loads
+
+from src.exceptions import WKTError
+from src.geo_utils import _file_to_wkt, is_wkt, to_openeo_wkt
+
+
+def feature(coords: list[list[float]]) -> dict:
+    return {"type": "Feature", "properties": {"name": "aoi"},
+            "geometry": {"type": "Polygon", "coordinates": [coords]}}
+
+
+class TestGeoUtils:
+
+    footprint = 'POLYGON((40 -20, 40 -15, 30 -15, 30 -20, 40 -20))'
+
+    @pytest.mark.parametrize("text", [
+        footprint,
+        '  point (30 10)',
+        'MULTIPOLYGON (((30 20, 45 40, 10 40, 30 20)))',
+        'GEOMETRYCOLLECTION (POINT (40 10))'])
+    def test_is_wkt(self, text):
+        assert is_wkt(text)
+
+    @pytest.mark.parametrize("text", [
+        'path/to/search_polygon.geojson',
+        'POLYGON((40 -20, 40 -15',
+        ''])
+    def test_is_not_wkt(self, text):
+        assert not is_wkt(text)
+
+    def test_file_to_wkt(self):
+        collection = {"type": "FeatureCollection", "features": [
+            feature([[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]),
+            feature([[1, 0], [2, 0], [2, 1], [1, 1], [1, 0]])]}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            aoi = Path(tmp_dir) / "aoi.geojson"
+            aoi.write_text(json.dumps(collection))
+
+            union = loads(_file_to_wkt(aoi))
+            assert union.geom_type == 'Polygon'
+            assert union.area == 2
+            assert loads(to_openeo_wkt(str(aoi))).equals(union)
+
+    def test_wkt_passthrough(self):
+        assert to_openeo_wkt(self.footprint) == self.footprint
+        assert to_openeo_wkt(None) is None
+
+    def test_missing_file(self):
+        with pytest.raises(WKTError):
+            to_openeo_wkt('path/to/missing.geojson')
@@ -0,0 +1,152 @@
+import logging
+
+import pytest
+
+from src import copernicus_api
+from src.copernicus_api import Sentinel2API, _literal
+
+
+class TestQuery:
+
+    records = [{'Id': str(i), 'Name': f'S2A_MSIL1C_{i}', 'Attributes': []}
+               for i in range(2500)]
+
+    def api_instance(self) -> Sentinel2API:
+        return Sentinel2API(username="user", password="pass")
+
+    def stub_pages(self, monkeypatch, count: bool=True) -> list[dict]:
+        """Serves `records` with $top/$skip paging, returns the sent params"""
+        sent = []
+
+        def fetch_page(api, url, params=None):
+            sent.append(params)
+            if params is None:
+                # nextLink, encoded as the skip value
+                skip = int(url)
+                top = copernicus_api.PAGE_SIZE
+            else:
+                skip = params.get("$skip", 0)
+                top = params["$top"]
+            page = {'value': self.records[skip:skip + top]}
+            if params and params.get("$count") == "true" and count:
+                page['@odata.count'] = len(self.records)
+            if params is None or "$skip" not in params and \
+                    "$count" not in params:
+                if skip + top < len(self.records):
+                    page['@odata.nextLink'] = str(skip + top)
+            return page
+
+        monkeypatch.setattr(Sentinel2API, "_fetch_page", fetch_page)
+        return sent
+
+    def test_literal(self):
+        assert _literal("GRD") == "'GRD'"
+        assert _literal("it's") == "'it''s'"
+
+    def test_build_query(self):
+        params = self.api_instance()._build_query(
+            start_time="2024-01-01",
+            end_time="2024-01-15",
+            prod_type="L1C",
+            exclude="O'Brien",
+            footprint="POLYGON((1 1, 2 1, 2 2, 1 1))",
+            orderby="desc")
+
+        assert params["$filter"] == (
+            "Collection/Name eq 'SENTINEL-2'"
+            " and ContentDate/Start gt 2024-01-01T00:00:00.000Z"
+            " and ContentDate/Start lt 2024-01-15T00:00:00.000Z"
+            " and contains(Name,'L1C')"
+            " and not contains(Name,'O''Brien')"
+            " and OData.CSC.Intersects(area=geography"
+            "'SRID=4326;POLYGON((1 1, 2 1, 2 2, 1 1))')")
+        assert params["$orderby"] == "ContentDate/Start desc"
+        assert params["$expand"] == "Attributes"
+
+    def test_fetch_page_encoding(self, monkeypatch):
+        sent = []
+
+        class Response:
+            content = b'{"value": []}'
+
+            def raise_for_status(self):
+                pass
+
+        def get(url, params=None, timeout=None):
+            sent.append(params)
+            return Response()
+
+        api = self.api_instance()
+        monkeypatch.setattr(api._session, "get", get)
+        api._fetch_page("url", {"$filter": "contains(Name,'L1C') and x/y",
+                                "$top": 10})
+
+        assert sent == ["$filter=contains(Name,'L1C')%20and%20x/y&$top=10"]
+
+    @pytest.mark.parametrize("limit", [None, 2500, 5000])
+    def test_paging(self, monkeypatch, limit):
+        sent = self.stub_pages(monkeypatch)
+        products = self.api_instance().query(start_time="2024-01-01",
+                                             end_time="2024-01-15",
+                                             limit=limit)
+
+        assert products['Id'].tolist() == [r['Id'] for r in self.records]
+        assert len(sent) == 3
+        # Offset pages are requested in a stable order
+        assert all(p["$orderby"] == "ContentDate/Start asc"
+                   for p in sent if p)
+
+    def test_paging_stops_at_short_page(self, monkeypatch):
+        sent = self.stub_pages(monkeypatch, count=False)
+        monkeypatch.setattr(self, "records", self.records[:10])
+        products = self.api_instance().query(start_time="2024-01-01",
+                                             end_time="2024-01-15",
+                                             limit=5000)
+
+        assert len(products) == 10
+        assert len(sent) == 1
+
+    def test_limit_truncates(self, monkeypatch):
+        self.stub_pages(monkeypatch)
+        products = self.api_instance().query(start_time="2024-01-01",
+                                             end_time="2024-01-15",
+                                             limit=1500)
+
+        assert len(products) == 1500
+
+    @pytest.mark.parametrize("limit", [None, 5000])
+    def test_skip_cap(self, monkeypatch, caplog, limit):
+        self.stub_pages(monkeypatch)
+        # Catalogue rejects $skip above MAX_SKIP
+        monkeypatch.setattr(copernicus_api, "MAX_SKIP", 1000)
+        with caplog.at_level(logging.WARNING):
+            products = self.api_instance().query(start_time="2024-01-01",
+                                                 end_time="2024-01-15",
+                                                 limit=limit)
+
+        assert len(products) == 2000
+        assert "only the first 2000 are returned" in caplog.text
+
+    def test_prod_types(self):
+        api = self.api_instance()
+        prod_types = api.prod_types
+        prod_types.append('L9X')
+
+        assert api.prod_types == ['L1C', 'L2A']
+
+    def test_unknown_prod_type_hint(self, monkeypatch, caplog):
+        monkeypatch.setattr(self, "records", [])
+        self.stub_pages(monkeypatch)
+        with caplog.at_level(logging.INFO):
+            products = self.api_instance().query(start_time="2024-01-01",
+                                                 end_time="2024-01-15",
+                                                 prod_type="L9X")
+
+        assert products.empty
+        assert "['L1C', 'L2A']" in caplog.text
+
+    def test_invalid_dtype_backend(self):
+        with pytest.raises(ValueError):
+            self.api_instance().query(start_time="2024-01-01",
+                                      end_time="2024-01-15",
+                                      dtype_backend="numpy")